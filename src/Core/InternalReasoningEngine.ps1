@@ -33,6 +33,8 @@ class InternalReasoningEngine {
     hidden [CodeExecutionEngine] $CodeExecutionEngine
     hidden [int] $MaxIterations = 5
     hidden [string] $PythonExecutable = "python"
+    hidden [string] $ReasoningServiceUrl = "http://localhost:3000/reason"
+    hidden [bool] $ReasoningServiceWarned = $false
 
     InternalReasoningEngine([Logger]$logger, [ContextManager]$contextManager, [CodeExecutionEngine]$codeExecutionEngine) {
         $this.Logger = $logger
@@ -40,6 +42,8 @@ class InternalReasoningEngine {
         $this.CodeExecutionEngine = $codeExecutionEngine
         $envPython = [Environment]::GetEnvironmentVariable('MCP_PYTHON')
         if ($envPython) { $this.PythonExecutable = $envPython }
+        $envReasoningUrl = [Environment]::GetEnvironmentVariable('MCP_REASONING_URL')
+        if ($envReasoningUrl) { $this.ReasoningServiceUrl = $envReasoningUrl }
     }
 
     [ReasoningResult] Resolve([hashtable]$issue, [OrchestrationSession]$session) {
@@ -136,12 +140,15 @@ class InternalReasoningEngine {
 
     hidden [ReasoningResult] InvokePythonEngine([hashtable]$issue, [hashtable]$context) {
         try {
-            $issueJson = $issue | ConvertTo-Json -Depth 10 -Compress
-            $ctxJson = $context | ConvertTo-Json -Depth 10 -Compress
-            $args = @('-m', 'src.python.internal_reasoning_engine', '--issue', $issueJson, '--context', $ctxJson)
-            $output = & $this.PythonExecutable $args 2>$null
-            if (-not $output) { return $null }
-            $obj = $output | ConvertFrom-Json
+            $obj = $this.InvokeReasoningService($issue, $context)
+            if (-not $obj) {
+                $issueJson = $issue | ConvertTo-Json -Depth 10 -Compress
+                $ctxJson = $context | ConvertTo-Json -Depth 10 -Compress
+                $args = @('-m', 'src.python.internal_reasoning_engine', '--issue', $issueJson, '--context', $ctxJson)
+                $output = & $this.PythonExecutable $args 2>$null
+                if (-not $output) { return $null }
+                $obj = $output | ConvertFrom-Json
+            }
             $res = [ReasoningResult]::new()
             $res.Resolved = $obj.resolved
             $res.Resolution = $obj.resolution
@@ -153,5 +160,27 @@ class InternalReasoningEngine {
             return $null
         }
     }
+
+    hidden [object] InvokeReasoningService([hashtable]$issue, [hashtable]$context) {
+        # The long-running service keeps the interpreter and match caches warm;
+        # the per-call python -m fallback is used only when it is unreachable.
+        try {
+            $body = @{ issue = $issue; context = $context } | ConvertTo-Json -Depth 11 -Compress
+            # explicit charset: before 7.4 a string body defaults to ISO-8859-1
+            $response = Invoke-RestMethod -Uri $this.ReasoningServiceUrl -Method Post -Body $body -ContentType 'application/json; charset=utf-8' -TimeoutSec 10
+            $this.ReasoningServiceWarned = $false
+            return $response
+        } catch {
+            $details = @{ Url = $this.ReasoningServiceUrl; Error = $_.Exception.Message }
+            if (-not $this.ReasoningServiceWarned) {
+                # warn once per outage so a bad MCP_REASONING_URL is visible
+                $this.Logger.Warning('Reasoning service unavailable, using python fallback', $details)
+                $this.ReasoningServiceWarned = $true
+            } else {
+                $this.Logger.Debug('Reasoning service unavailable, using python fallback', $details)
+            }
+            return $null
+        }
+    }
 }
 
@@ -1,26 +1,47 @@
 from __future__ import annotations
 import logging
 import re
-import difflib
 import json
 import os
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+from rapidfuzz import fuzz, process
+
+# minimum similarity score (0-100) for a fuzzy suggestion to be accepted
+MATCH_CUTOFF = 70
+# number of prepared candidate lists retained between calls
+CANDIDATE_CACHE_SIZE = 32
+# number of distinct candidate strings shared through the intern pool
+INTERN_POOL_SIZE = 10000
+_ENTITY_SOURCES = (("user", "KnownUsers"), ("mailbox", "KnownMailboxes"))
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+_TOKEN_RE = re.compile(r"[A-Za-z0-9._-]+")
+_HAS_ALPHA = re.compile(r"[A-Za-z]")
+
+def _tail_unique(values: List[Any], limit: int = 50) -> List[Any]:
+    """Return the last ``limit`` distinct values, scanning from the end."""
+    seen = set()
+    tail: List[Any] = []
+    for value in reversed(values):
+        if value in seen:
+            continue
+        seen.add(value)
+        tail.append(value)
+        if len(tail) == limit:
+            break
+    tail.reverse()
+    return tail
+
+@dataclass(slots=True)
 class ReasoningResult:
     """Represents the outcome of a reasoning attempt."""
 
-    def __init__(
-        self,
-        resolved: bool = False,
-        resolution: str = "",
-        updated_request: Optional[Dict[str, Any]] = None,
-        actions: Optional[List[str]] = None,
-    ) -> None:
-        self.resolved = resolved
-        self.resolution = resolution
-        self.updated_request = updated_request or {}
-        self.actions = actions or []
-        self.suggested_plan: Optional[Dict[str, Any]] = None
+    resolved: bool = False
+    resolution: str = ""
+    updated_request: Dict[str, Any] = field(default_factory=dict)
+    actions: List[str] = field(default_factory=list)
+    suggested_plan: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -35,59 +56,119 @@ class InternalReasoningEngine:
     """Python implementation of the MCP internal reasoning tool.
 
     This module analyzes context, validation results and tool failures to
-    determine automatic remediation steps. It is designed to be called from
-    PowerShell via `python -m` execution or as a REST microservice.
+    determine automatic remediation steps. It is designed to run inside the
+    long-lived REST microservice (``/reason``) so its caches stay warm, with
+    `python -m` execution kept as a fallback for PowerShell.
     """
 
     def __init__(self, logger: Optional[logging.Logger] = None, max_iterations: int = 3) -> None:
         self.logger = logger or logging.getLogger(__name__)
         # clamp the iteration count to a sane range
         self.max_iterations = max(1, min(max_iterations, 10))
+        # email local parts keyed by the candidate contents so a long-lived
+        # engine reuses them across requests
+        self._candidate_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        # one shared object per distinct Known* entry across requests
+        self._intern: Dict[str, str] = {}
+        # environment details do not change for the lifetime of the process
+        self._env_cache: Optional[Dict[str, Any]] = None
+
+    def _local_parts(self, candidates: List[str]) -> Tuple[str, ...]:
+        """Return the cached email local parts of a candidate list."""
+        key = tuple(candidates)
+        local_parts = self._candidate_cache.get(key)
+        if local_parts is None:
+            local_parts = tuple(c.split('@', 1)[0] for c in key)
+            if len(self._candidate_cache) >= CANDIDATE_CACHE_SIZE:
+                self._candidate_cache.clear()
+            self._candidate_cache[key] = local_parts
+        return local_parts
 
     def _suggest_match(self, value: str, candidates: List[str]) -> Optional[str]:
         """Return the closest match using fuzzy matching."""
         if not value or not candidates:
             return None
-        lower_candidates = [c.lower() for c in candidates]
-        matches = difflib.get_close_matches(value.lower(), lower_candidates, n=1, cutoff=0.7)
-        if matches:
-            return matches[0]
+        match = process.extractOne(
+            value, candidates, scorer=fuzz.ratio, processor=str.lower, score_cutoff=MATCH_CUTOFF
+        )
+        if match:
+            return match[0]
         # fallback to match against the local part of email addresses
-        local_parts = [c.split('@')[0] for c in lower_candidates]
-        match = difflib.get_close_matches(value.lower(), local_parts, n=1, cutoff=0.7)
+        match = process.extractOne(
+            value, self._local_parts(candidates), scorer=fuzz.ratio,
+            processor=str.lower, score_cutoff=MATCH_CUTOFF,
+        )
         if match:
-            idx = local_parts.index(match[0])
-            return lower_candidates[idx]
+            return candidates[match[2]]
         return None
 
+    def _suggest_matches(self, values: List[str], candidates: List[str]) -> List[Optional[str]]:
+        """Return the closest match for each value using one batched search."""
+        if len(values) == 1:
+            # a single query is cheaper through extractOne than a cdist setup
+            return [self._suggest_match(values[0], candidates)]
+        results: List[Optional[str]] = [None] * len(values)
+        if not values or not candidates:
+            return results
+        scores = process.cdist(
+            values, candidates, scorer=fuzz.ratio, processor=str.lower,
+            score_cutoff=MATCH_CUTOFF, workers=-1,
+        )
+        pending: List[int] = []
+        for row, col in enumerate(scores.argmax(axis=1)):
+            if values[row] and scores[row, col] >= MATCH_CUTOFF:
+                results[row] = candidates[col]
+            elif values[row]:
+                pending.append(row)
+        if not pending:
+            return results
+        # fallback to match against the local part of email addresses
+        scores = process.cdist(
+            [values[i] for i in pending], self._local_parts(candidates), scorer=fuzz.ratio,
+            processor=str.lower, score_cutoff=MATCH_CUTOFF, workers=-1,
+        )
+        for row, col in enumerate(scores.argmax(axis=1)):
+            if scores[row, col] >= MATCH_CUTOFF:
+                results[pending[row]] = candidates[col]
+        return results
+
     def _extract_identifier(self, text: str) -> str:
         """Extract a likely identifier such as an email or token from text."""
-        email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
-        match = re.search(email_pattern, text)
+        match = _EMAIL_RE.search(text)
         if match:
             return match.group(0)
 
-        tokens = re.findall(r"[A-Za-z0-9._-]+", text)
-        for tok in tokens:
+        last = None
+        for token in _TOKEN_RE.finditer(text):
+            tok = last = token.group(0)
             if (
                 len(tok) >= 3
                 and not tok.isdigit()
                 and ("." in tok or "_" in tok)
-                and re.search(r"[A-Za-z]", tok)
+                and _HAS_ALPHA.search(tok)
             ):
                 return tok
-        return tokens[-1] if tokens else text
+        return last if last is not None else text
+
+    def _intern_list(self, values: List[Any]) -> List[Any]:
+        """Replace equal candidate strings with a single pooled instance."""
+        if len(self._intern) >= INTERN_POOL_SIZE:
+            self._intern.clear()
+        pool = self._intern
+        return [pool.setdefault(v, v) if isinstance(v, str) else v for v in values]
 
     def collect_environment_context(self) -> Dict[str, Any]:
         """Return minimal environment context for diagnostics."""
-        try:
-            return {
-                "cwd": os.getcwd(),
-                "user": os.environ.get("USER", "unknown"),
-                "hostname": os.uname().nodename,
-            }
-        except Exception:  # pragma: no cover - environment may not expose uname
-            return {"cwd": os.getcwd()}
+        if self._env_cache is None:
+            try:
+                self._env_cache = {
+                    "cwd": os.getcwd(),
+                    "user": os.environ.get("USER", "unknown"),
+                    "hostname": os.uname().nodename,
+                }
+            except Exception:  # pragma: no cover - environment may not expose uname
+                self._env_cache = {"cwd": os.getcwd()}
+        return dict(self._env_cache)
 
     def aggregate_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Aggregate known context into a normalized dictionary.
@@ -101,8 +182,10 @@ class InternalReasoningEngine:
             if value is None:
                 continue
             if isinstance(value, list):
-                unique_vals = list(dict.fromkeys(value))
-                aggregated[key] = unique_vals[-50:]
+                unique_vals = _tail_unique(value)
+                if isinstance(key, str) and key.startswith("Known"):
+                    unique_vals = self._intern_list(unique_vals)
+                aggregated[key] = unique_vals
             elif isinstance(value, dict):
                 if value:
                     aggregated[key] = value
@@ -119,15 +202,16 @@ class InternalReasoningEngine:
             raise ValueError("context must be a dictionary")
 
     def _root_cause_analysis(self, issue: Dict[str, Any]) -> str:
-        msg = str(issue.get("Error", ""))
-        if "timeout" in msg.lower():
+        msg = str(issue.get("Error", "")).lower()
+        if "timeout" in msg:
             return "Timeout"
-        if "network" in msg.lower():
+        if "network" in msg:
             return "NetworkError"
-        if "permission" in msg.lower():
+        if "permission" in msg:
             return "PermissionDenied"
-        if "rate" in msg.lower() and "limit" in msg.lower():
+        if "rate" in msg and "limit" in msg:
             return "RateLimit"
+        return "Unknown"
 
     def _suggest_next_steps(self, cause: Optional[str]) -> Tuple[bool, List[str]]:
         """Return suggested remediation actions based on root cause."""
@@ -193,18 +277,37 @@ class InternalReasoningEngine:
             res.resolution = "Validation warnings acknowledged"
             return res
 
-        suggestions: Dict[str, str] = {}
-        for err in errors:
+        candidates = {kind: context.get(key) or [] for kind, key in _ENTITY_SOURCES}
+        if not any(candidates.values()):
+            # nothing to match against, so skip identifier extraction entirely
+            res.resolution = "Unable to auto-resolve validation errors"
+            res.actions.append("Validation errors: {}".format("; ".join(errors)))
+            return res
+
+        # group identifiers by entity class, remembering each error's position
+        queries: Dict[str, List[Tuple[int, str]]] = {kind: [] for kind, _ in _ENTITY_SOURCES}
+        for idx, err in enumerate(errors):
             lowered = err.lower()
-            identifier = self._extract_identifier(err)
             if "user" in lowered:
-                match = self._suggest_match(identifier, context.get("KnownUsers", []))
-                if match:
-                    suggestions[identifier] = match
+                kind = "user"
             elif "mailbox" in lowered:
-                match = self._suggest_match(identifier, context.get("KnownMailboxes", []))
+                kind = "mailbox"
+            else:
+                continue
+            if candidates[kind]:
+                queries[kind].append((idx, self._extract_identifier(err)))
+
+        matched: Dict[int, Tuple[str, str]] = {}
+        for kind, _ in _ENTITY_SOURCES:
+            if not queries[kind]:
+                continue
+            identifiers = [identifier for _, identifier in queries[kind]]
+            matches = self._suggest_matches(identifiers, candidates[kind])
+            for (idx, identifier), match in zip(queries[kind], matches):
                 if match:
-                    suggestions[identifier] = match
+                    matched[idx] = (identifier, match)
+
+        suggestions: Dict[str, str] = dict(matched[idx] for idx in sorted(matched))
 
         if suggestions:
             res.resolved = True
@@ -246,14 +349,20 @@ class InternalReasoningEngine:
 if __name__ == "__main__":
     import argparse
 
+    try:
+        from orjson import loads
+    except ImportError:  # pragma: no cover - stdlib fallback
+        loads = json.loads
+
     parser = argparse.ArgumentParser(description="Run MCP internal reasoning")
     parser.add_argument("--issue", required=True, help="JSON string describing the issue")
     parser.add_argument("--context", required=True, help="JSON string describing context")
     args = parser.parse_args()
 
     engine = InternalReasoningEngine()
-    issue = json.loads(args.issue)
-    context = json.loads(args.context)
+    issue = loads(args.issue)
+    context = loads(args.context)
     result = engine.resolve(issue, context)
+    # stdlib json escapes non-ASCII, so the output survives non-UTF-8 consoles
     print(json.dumps(result.to_dict()))
 
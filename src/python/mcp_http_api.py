@@ -1,60 +1,177 @@
 import asyncio
 import json
+import logging
 import os
 import uuid
-import subprocess
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from .internal_reasoning_engine import InternalReasoningEngine
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# bytes requested per read of the server's stdout pipe
+READ_CHUNK_SIZE = 65536
 
 SCRIPT_PATH = os.environ.get("MCP_SCRIPT", "/opt/mcp/src/MCPServer.ps1")
 CORE_MODULE = os.environ.get("MCP_CORE_MODULE", "/opt/mcp/src/Mcp.Core.psm1")
 
+def _encode(message: Dict[str, Any]) -> bytes:
+    if orjson:
+        return orjson.dumps(message) + b"\n"
+    return (json.dumps(message) + "\n").encode()
+
+def _decode(line: memoryview) -> Any:
+    return orjson.loads(line) if orjson else json.loads(bytes(line))
+
 class MCPBridge:
     def __init__(self, script: str, module: str) -> None:
-        self.proc = subprocess.Popen([
-            "pwsh",
-            "-NoProfile",
-            "-ExecutionPolicy",
-            "Bypass",
-            "-Command",
-            f"Import-Module '{module}'; & '{script}'"
-        ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        self.script = script
+        self.module = module
+        self.proc: asyncio.subprocess.Process | None = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._stdout_fd: int | None = None
+        self._buf = bytearray()
+
+    async def start(self) -> None:
+        # stdout is a raw pipe drained in large chunks by an event loop reader
+        # rather than a StreamReader, so many lines are framed per syscall
+        read_fd, write_fd = os.pipe()
+        try:
+            self.proc = await asyncio.create_subprocess_exec(
+                "pwsh",
+                "-NoProfile",
+                "-ExecutionPolicy",
+                "Bypass",
+                "-Command",
+                f"Import-Module '{self.module}'; & '{self.script}'",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=write_fd,
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        self._stdout_fd = read_fd
+        asyncio.get_running_loop().add_reader(read_fd, self._on_readable)
+
+    def _on_readable(self) -> None:
+        """Read available stdout and route each complete line to its waiter."""
+        try:
+            chunk = os.read(self._stdout_fd, READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self._close_stdout()
+            self._fail_pending()
+            return
+        self._buf += chunk
+        start = 0
+        try:
+            with memoryview(self._buf) as view:
+                while (nl := self._buf.find(b"\n", start)) != -1:
+                    # release each slice explicitly; a logged traceback may
+                    # still reference it when the buffer is trimmed
+                    try:
+                        with view[start:nl] as line:
+                            self._dispatch(line)
+                    except Exception:
+                        logger.exception("Dropping unreadable MCP server output line")
+                    start = nl + 1
+        finally:
+            # consumed lines must always leave the buffer or they are replayed
+            del self._buf[:start]
+
+    def _dispatch(self, line: memoryview) -> None:
+        try:
+            resp = _decode(line)
+        except ValueError:
+            return
+        if not isinstance(resp, dict):
+            return
+        rid = resp.get("id")
+        if not isinstance(rid, (str, int)):
+            return
+        fut = self._pending.pop(rid, None)
+        if fut and not fut.done():
+            fut.set_result(resp)
+
+    def _close_stdout(self) -> None:
+        if self._stdout_fd is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._stdout_fd)
+        os.close(self._stdout_fd)
+        self._stdout_fd = None
+        self._buf.clear()
+
+    def _fail_pending(self) -> None:
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(HTTPException(status_code=500, detail="MCP server terminated"))
+        self._pending.clear()
 
     async def send(self, method: str, params: Dict[str, Any] | None = None) -> Any:
+        if not self.proc or not self.proc.stdin or self._stdout_fd is None:
+            raise HTTPException(status_code=500, detail="MCP server terminated")
         request_id = str(uuid.uuid4())
         request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
-        assert self.proc.stdin
-        self.proc.stdin.write(json.dumps(request) + "\n")
-        self.proc.stdin.flush()
-        while True:
-            line = await asyncio.get_event_loop().run_in_executor(None, self.proc.stdout.readline)
-            if not line:
-                raise HTTPException(status_code=500, detail="MCP server terminated")
-            try:
-                resp = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if resp.get("id") == request_id:
-                if "error" in resp:
-                    raise HTTPException(status_code=500, detail=resp["error"].get("message"))
-                return resp.get("result")
-
-    def stop(self) -> None:
-        if self.proc and self.proc.poll() is None:
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+        try:
+            async with self._write_lock:
+                self.proc.stdin.write(_encode(request))
+                await self.proc.stdin.drain()
+            resp = await fut
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in resp:
+            raise HTTPException(status_code=500, detail=resp["error"].get("message"))
+        return resp.get("result")
+
+    async def stop(self) -> None:
+        self._close_stdout()
+        if self.proc and self.proc.returncode is None:
             self.proc.terminate()
+            await self.proc.wait()
+        self._fail_pending()
 
 bridge = MCPBridge(SCRIPT_PATH, CORE_MODULE)
+engine = InternalReasoningEngine()
 app = FastAPI()
 
+@app.on_event("startup")
+async def startup_event() -> None:
+    await bridge.start()
+
 @app.on_event("shutdown")
-def shutdown_event() -> None:
-    bridge.stop()
+async def shutdown_event() -> None:
+    await bridge.stop()
 
 @app.post("/tools/call")
 async def call_tool(payload: Dict[str, Any]):
     return await bridge.send("tools/call", payload)
 
+class ReasonRequest(BaseModel):
+    issue: Dict[str, Any]
+    context: Optional[Dict[str, Any]] = None
+
+@app.post("/reason")
+def reason(payload: ReasonRequest) -> Dict[str, Any]:
+    result = engine.resolve(payload.issue, payload.context or {})
+    return result.to_dict()
+
 @app.get("/health")
 async def health() -> Dict[str, str]:
     return {"status": "ok"}
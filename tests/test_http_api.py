@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.python.mcp_http_api import app
+
+class ReasonEndpointTests(unittest.TestCase):
+    def setUp(self):
+        # not entered as a context manager, so startup never spawns pwsh
+        self.client = TestClient(app)
+
+    def test_reason_applies_corrections(self):
+        payload = {
+            "issue": {
+                "Type": "ValidationFailure",
+                "ValidationResult": {"Errors": ["user bob.smiht not found"]},
+            },
+            "context": {"KnownUsers": ["bob.smith@piercecountywa.gov"]},
+        }
+        resp = self.client.post("/reason", json=payload)
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertTrue(body["resolved"])
+        self.assertEqual(body["updated_request"]["Corrections"], {"bob.smiht": "bob.smith@piercecountywa.gov"})
+
+    def test_reason_without_context(self):
+        resp = self.client.post("/reason", json={"issue": {"Type": "ToolError", "Error": "timeout"}})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()["resolved"])
+
+    def test_reason_rejects_malformed_payload(self):
+        for payload in ({}, {"issue": "boom"}, {"issue": {}, "context": []}):
+            resp = self.client.post("/reason", json=payload)
+            self.assertEqual(resp.status_code, 422)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.python import mcp_http_api
+from src.python.mcp_http_api import MCPBridge
+
+# Stand-in for the PowerShell server: echoes params back as the result,
+# holding "hold" requests until a "release" arrives and answering those in
+# reverse order, splitting "split" responses across two writes and exiting
+# without a reply on "exit".
+ECHO_SERVER = r'''
+import json, sys, time
+held = []
+def reply(req):
+    return json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": req["params"]}) + "\n"
+for line in sys.stdin:
+    req = json.loads(line)
+    method = req["method"]
+    if method == "exit":
+        sys.exit(0)
+    if method == "hold":
+        held.append(req)
+        continue
+    sys.stdout.write("not json\n")
+    sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": ["bad"], "result": None}) + "\n")
+    sys.stdout.write(json.dumps({"jsonrpc": "2.0", "method": "notifications/progress"}) + "\n")
+    out = reply(req)
+    if method == "split":
+        half = len(out) // 2
+        sys.stdout.write(out[:half])
+        sys.stdout.flush()
+        time.sleep(0.05)
+        out = out[half:]
+    if method == "release":
+        out += "".join(reply(r) for r in reversed(held))
+        held.clear()
+    sys.stdout.write(out)
+    sys.stdout.flush()
+'''
+
+_create_subprocess_exec = asyncio.create_subprocess_exec
+
+async def _spawn_echo_server(*args, **kwargs):
+    return await _create_subprocess_exec(sys.executable, "-c", ECHO_SERVER, **kwargs)
+
+class MCPBridgeTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(mcp_http_api.asyncio, "create_subprocess_exec", _spawn_echo_server)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bridge = MCPBridge("MCPServer.ps1", "Mcp.Core.psm1")
+        await self.bridge.start()
+
+    async def asyncTearDown(self):
+        await self.bridge.stop()
+
+    async def test_concurrent_sends(self):
+        sends = asyncio.gather(*(self.bridge.send("tools/call", {"n": i}) for i in range(50)))
+        results = await asyncio.wait_for(sends, timeout=10)
+        self.assertEqual([r["n"] for r in results], list(range(50)))
+
+    async def test_out_of_order_responses(self):
+        held = [asyncio.create_task(self.bridge.send("hold", {"n": i})) for i in range(3)]
+        await asyncio.sleep(0.1)
+        self.assertEqual(await self.bridge.send("release", {"n": "r"}), {"n": "r"})
+        self.assertEqual([(await t)["n"] for t in held], [0, 1, 2])
+
+    async def test_line_split_across_reads(self):
+        self.assertEqual(await self.bridge.send("split", {"text": "x" * 1000}), {"text": "x" * 1000})
+        self.assertEqual(await self.bridge.send("tools/call", {"n": 1}), {"n": 1})
+
+    async def test_decoder_errors_do_not_stall_reader(self):
+        decode = mcp_http_api._decode
+
+        def failing_decode(line):
+            if bytes(line) == b"not json":
+                raise RecursionError("maximum recursion depth exceeded")
+            return decode(line)
+
+        with mock.patch.object(mcp_http_api, "_decode", failing_decode), \
+                self.assertLogs(mcp_http_api.logger, "ERROR"):
+            for n in range(3):
+                result = await asyncio.wait_for(self.bridge.send("tools/call", {"n": n}), timeout=5)
+                self.assertEqual(result, {"n": n})
+        self.assertEqual(self.bridge._buf, bytearray())
+
+    async def test_server_exit_fails_pending(self):
+        pending = asyncio.create_task(self.bridge.send("hold", {}))
+        await asyncio.sleep(0.1)
+        with self.assertRaises(HTTPException):
+            await asyncio.wait_for(self.bridge.send("exit", {}), timeout=5)
+        with self.assertRaises(HTTPException):
+            await pending
+        with self.assertRaises(HTTPException):
+            await self.bridge.send("tools/call", {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,12 +21,105 @@ class ReasoningTests(unittest.TestCase):
         self.assertTrue(res.resolved)
         self.assertIn("Corrections", res.updated_request)
 
+    def test_validation_correction_multiple_errors(self):
+        issue = {
+            "Type": "ValidationFailure",
+            "ValidationResult": {
+                "Errors": [
+                    "mailbox shared_mialbox not found",
+                    "user bob.smiht not found",
+                    "user zzz not found",
+                    "user alice.jnoes not found",
+                ]
+            }
+        }
+        ctx = {
+            "KnownUsers": ["bob.smith@piercecountywa.gov", "alice.jones@piercecountywa.gov"],
+            "KnownMailboxes": ["shared_mailbox@piercecountywa.gov"],
+        }
+        res = self.engine.resolve(issue, ctx)
+        self.assertTrue(res.resolved)
+        self.assertEqual(res.updated_request["Corrections"], {
+            "shared_mialbox": "shared_mailbox@piercecountywa.gov",
+            "bob.smiht": "bob.smith@piercecountywa.gov",
+            "alice.jnoes": "alice.jones@piercecountywa.gov",
+        })
+
+    def test_validation_correction_mixed_batches(self):
+        errors = ["user bob.smiht not found", "mailbox shared_mialbox not found"] * 4
+        issue = {"Type": "ValidationFailure", "ValidationResult": {"Errors": errors}}
+        ctx = {
+            "KnownUsers": ["bob.smith@piercecountywa.gov"],
+            "KnownMailboxes": ["shared_mailbox@piercecountywa.gov"],
+        }
+        res = self.engine.resolve(issue, ctx)
+        self.assertEqual(res.updated_request["Corrections"], {
+            "bob.smiht": "bob.smith@piercecountywa.gov",
+            "shared_mialbox": "shared_mailbox@piercecountywa.gov",
+        })
+
+    def test_validation_without_candidates(self):
+        issue = {
+            "Type": "ValidationFailure",
+            "ValidationResult": {
+                "Errors": ["user bob.smiht not found"]
+            }
+        }
+        res = self.engine._resolve_validation_failure(issue, {"KnownUsers": []})
+        self.assertFalse(res.resolved)
+        self.assertEqual(res.resolution, "Unable to auto-resolve validation errors")
+        self.assertIn("user bob.smiht not found", res.actions[0])
+
+    def test_suggest_match_returns_full_address(self):
+        candidates = ["Bob.Smith@piercecountywa.gov", "alice.jones@piercecountywa.gov"]
+        self.assertEqual(self.engine._suggest_match("alice.jnoes", candidates), "alice.jones@piercecountywa.gov")
+        self.assertEqual(self.engine._suggest_match("BOB.SMIHT", candidates), "Bob.Smith@piercecountywa.gov")
+        self.assertIsNone(self.engine._suggest_match("zzz", candidates))
+
+    def test_suggest_match_rejects_substrings(self):
+        candidates = [
+            "bob.smith@piercecountywa.gov",
+            "alice.jones@piercecountywa.gov",
+            "john.doe@piercecountywa.gov",
+            "jdoe@piercecountywa.gov",
+        ]
+        for value in ("gov", "county"):
+            self.assertIsNone(self.engine._suggest_match(value, candidates))
+        self.assertEqual(self.engine._suggest_matches(["gov", "county"], candidates), [None, None])
+
+    def test_suggest_match_keeps_punctuation(self):
+        candidates = ["john.doe@piercecountywa.gov", "jdoe@piercecountywa.gov"]
+        self.assertEqual(self.engine._suggest_match("j.doe", candidates), "jdoe@piercecountywa.gov")
+        self.assertEqual(
+            self.engine._suggest_matches(["j.doe", "J.Doe"], candidates),
+            ["jdoe@piercecountywa.gov", "jdoe@piercecountywa.gov"],
+        )
+
     def test_unknown_issue(self):
         issue = {"Type": "Other", "Error": "boom"}
         res = self.engine.resolve(issue, {})
         self.assertFalse(res.resolved)
         self.assertIn("Escalation", res.resolution)
 
+    def test_aggregate_context_keeps_recent_unique_values(self):
+        values = [f"user{i}" for i in range(100)] + ["user99", "user0"]
+        aggregated = self.engine.aggregate_context({"KnownUsers": values, "Empty": None})
+        self.assertNotIn("Empty", aggregated)
+        self.assertEqual(len(aggregated["KnownUsers"]), 50)
+        self.assertEqual(aggregated["KnownUsers"][-2:], ["user99", "user0"])
+        self.assertIn("environment", aggregated)
+
+    def test_root_cause_analysis(self):
+        cases = {
+            "Network timeout contacting Graph": "Timeout",
+            "network unreachable": "NetworkError",
+            "Permission denied for mailbox": "PermissionDenied",
+            "Request limit hit: rate exceeded": "RateLimit",
+            "boom": "Unknown",
+        }
+        for error, cause in cases.items():
+            self.assertEqual(self.engine._root_cause_analysis({"Error": error}), cause)
+
     def test_extract_identifier_email(self):
         text = "Error: user alice.jones@example.com not found"
         ident = self.engine._extract_identifier(text)